@@ -17,6 +17,10 @@ ARTICLES_DIR = os.path.join(BASE_DIR, 'data', 'articles')
 # Usaremos 'chroma_db' como o nome do diretório do banco de dados Chroma
 CHROMA_DB_DIR = os.path.join(BASE_DIR, 'data', 'chroma_db')
 
+# Caminho para o cache de embeddings usado pela avaliação de recuperação
+# (textos inalterados não têm o embedding recalculado entre execuções)
+EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'embedding_cache')
+
 # --- Configurações do LM Studio (LLM) ---
 # Endereço base do servidor LM Studio (padrão é http://localhost:1234/v1)
 # Você pode configurar isso como uma variável de ambiente se preferir, mas aqui está direto para simplificar
@@ -34,6 +38,38 @@ EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
+# --- Configurações do Cache Semântico de Respostas ---
+# Similaridade de cosseno mínima entre duas perguntas para reutilizar uma resposta já gerada.
+ANSWER_CACHE_SIMILARITY_THRESHOLD = 0.95
+# Tempo de vida (em segundos) de uma resposta no cache.
+ANSWER_CACHE_TTL_SECONDS = 3600
+# Número máximo de respostas mantidas no cache (as menos usadas recentemente são descartadas).
+ANSWER_CACHE_MAX_ENTRIES = 256
+
+# --- Configurações de Sessão de Conversa ---
+# Número de chunks buscados em cada pergunta da sessão; igual ao de uma consulta isolada, de modo
+# que uma pergunta de acompanhamento sempre tenha no contexto os mesmos chunks que teria sozinha.
+SESSION_INITIAL_K = 5
+SESSION_FOLLOWUP_K = 5
+# Número máximo de chunks no contexto da sessão: os da busca atual mais uma folga de 3 chunks de
+# turnos anteriores, o que permite acrescentar só os chunks ausentes por alguns turnos sem mudar o prefixo.
+SESSION_MAX_CONTEXT_CHUNKS = 8
+# Ao exceder o limite, o contexto é compactado para este número de chunks (os mais recentes),
+# deixando espaço para os turnos seguintes voltarem a apenas acrescentar chunks ao final.
+SESSION_COMPACTED_CHUNKS = 5
+# Tamanho máximo, em caracteres, do histórico da conversa enviado à LLM.
+SESSION_HISTORY_MAX_CHARS = CHUNK_SIZE
+# Número de turnos recentes enviados com a resposta quase completa, e tamanho máximo dessas respostas.
+SESSION_RECENT_TURNS = 2
+SESSION_RECENT_ANSWER_CHARS = 300
+# Número de turnos anteriores mantidos no resumo da conversa, e tamanho máximo das respostas resumidas.
+SESSION_SUMMARY_TURNS = 4
+SESSION_SUMMARY_ANSWER_CHARS = 100
+# Perguntas com até este número de palavras são tratadas como continuação do turno anterior.
+SESSION_FOLLOWUP_MAX_WORDS = 4
+# Número de termos-chave da última resposta acrescentados à busca de uma pergunta de continuação.
+SESSION_REWRITE_KEY_TERMS = 5
+
 # --- Metadados Padrão ---
 # Metadados que podem ser adicionados aos documentos carregados
 DEFAULT_METADATA = {
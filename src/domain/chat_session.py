@@ -0,0 +1,230 @@
+# src/domain/chat_session.py
+
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import List, Tuple
+from langchain_core.documents import Document
+
+from src.core.config import (
+    SESSION_MAX_CONTEXT_CHUNKS,
+    SESSION_COMPACTED_CHUNKS,
+    SESSION_HISTORY_MAX_CHARS,
+    SESSION_RECENT_TURNS,
+    SESSION_RECENT_ANSWER_CHARS,
+    SESSION_SUMMARY_TURNS,
+    SESSION_SUMMARY_ANSWER_CHARS,
+    SESSION_FOLLOWUP_MAX_WORDS,
+    SESSION_REWRITE_KEY_TERMS,
+)
+
+# Palavras que indicam que a pergunta depende do turno anterior ("e isso?", "what about it?")
+_ANAPHORIC_WORDS = {
+    "isso", "isto", "esse", "essa", "esses", "essas", "este", "esta", "estes", "estas",
+    "disso", "disto", "desse", "dessa", "deste", "desta", "nisso", "nesse", "nessa",
+    "ele", "ela", "eles", "elas", "dele", "dela", "deles", "delas", "aquele", "aquela",
+    "mesmo", "mesma", "também", "anterior", "acima",
+    "it", "its", "this", "that", "these", "those", "they", "them", "above",
+}
+
+# Palavras sem valor de busca, ignoradas ao extrair os termos-chave da última resposta
+_STOPWORDS = {
+    "para", "como", "mais", "pelo", "pela", "pelos", "pelas", "sobre", "entre", "quando",
+    "onde", "qual", "quais", "porque", "também", "muito", "pode", "podem", "essa", "esse",
+    "isso", "este", "esta", "estes", "estas", "essas", "esses", "sendo", "foram", "seja",
+    "será", "ainda", "apenas", "cada", "outro", "outra", "outros", "outras", "mesmo",
+    "documentos", "contexto", "informações", "artigo", "artigos",
+    "with", "from", "that", "this", "which", "their", "there", "these", "those", "have",
+    "were", "been", "into", "also", "than", "then", "such",
+}
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[:max_chars] + "..."
+
+
+class ChatSession:
+    """
+    Sessão de conversa com memória entre perguntas.
+
+    Mantém os chunks já recuperados (em ordem de chegada, para que o início do prompt
+    permaneça idêntico entre turnos e possa ser reaproveitado por servidores LLM com
+    cache de prefixo), os turnos recentes e um resumo dos turnos mais antigos.
+    O contexto e o histórico têm limites fixos, de modo que o tamanho do prompt de uma
+    pergunta de acompanhamento fique limitado mesmo em conversas longas.
+    """
+
+    def __init__(self,
+                 max_context_chunks: int = SESSION_MAX_CONTEXT_CHUNKS,
+                 compacted_chunks: int = SESSION_COMPACTED_CHUNKS,
+                 history_max_chars: int = SESSION_HISTORY_MAX_CHARS,
+                 recent_turns: int = SESSION_RECENT_TURNS,
+                 summary_turns: int = SESSION_SUMMARY_TURNS):
+        """
+        Inicializa a sessão de conversa.
+
+        Args:
+            max_context_chunks (int): Número máximo de chunks mantidos no contexto.
+            compacted_chunks (int): Número de chunks mantidos quando o contexto é compactado.
+            history_max_chars (int): Tamanho máximo, em caracteres, do histórico enviado à LLM.
+            recent_turns (int): Número de turnos recentes enviados quase integralmente.
+            summary_turns (int): Número de turnos anteriores mantidos de forma resumida.
+        """
+        self.max_context_chunks = max_context_chunks
+        self.compacted_chunks = compacted_chunks
+        self.history_max_chars = history_max_chars
+        self.recent_turns = recent_turns
+        self.summary_turns = summary_turns
+        self.documents: "OrderedDict[str, Document]" = OrderedDict()
+        self.turns: List[Tuple[str, str]] = []
+        self.last_context = ""
+
+    @property
+    def has_history(self) -> bool:
+        """Indica se a sessão já possui algum turno de conversa."""
+        return bool(self.turns)
+
+    @staticmethod
+    def _is_followup(question: str) -> bool:
+        """
+        Indica se a pergunta parece depender do turno anterior: é curta, começa com "e"
+        ("e o segundo experimento?") ou contém uma referência anafórica.
+        """
+        words = re.findall(r"\w+", question.lower())
+        if len(words) <= SESSION_FOLLOWUP_MAX_WORDS or (words and words[0] in ("e", "and")):
+            return True
+        return any(word in _ANAPHORIC_WORDS for word in words)
+
+    @staticmethod
+    def _key_terms(text: str, limit: int) -> List[str]:
+        """
+        Extrai os termos mais frequentes de um texto, ignorando palavras curtas e sem valor de busca.
+        """
+        words = [word for word in re.findall(r"\w+", text.lower()) if len(word) > 3 and word not in _STOPWORDS]
+        return [word for word, _ in Counter(words).most_common(limit)]
+
+    def rewrite_query(self, question: str) -> str:
+        """
+        Reescreve uma pergunta de acompanhamento para a busca vetorial.
+        Perguntas que parecem depender do turno anterior são combinadas com a pergunta anterior
+        e com os termos-chave da última resposta; perguntas autônomas (ex: mudança de assunto)
+        são usadas como estão, para não arrastar o assunto antigo para a busca.
+
+        Args:
+            question (str): A pergunta atual do usuário.
+
+        Returns:
+            str: A consulta a ser usada na busca vetorial.
+        """
+        if not self.turns or not self._is_followup(question):
+            return question
+        previous_question, previous_answer = self.turns[-1]
+        key_terms = " ".join(self._key_terms(previous_answer, SESSION_REWRITE_KEY_TERMS))
+        return f"{previous_question}\n{key_terms}\n{question}"
+
+    def add_documents(self, documents: List[Document]) -> Tuple[List[Document], bool]:
+        """
+        Adiciona ao contexto os chunks recuperados que ainda não estão na sessão.
+
+        Regra de estabilidade do prefixo: o bloco de contexto só cresce no final, então os
+        chunks já enviados nunca mudam de posição e o servidor LLM reaproveita o prefixo.
+        Quando os novos chunks não cabem no limite, o bloco é compactado de uma só vez: ficam os
+        chunks mais recentes da sessão e os novos, até `compacted_chunks` no total. Isso custa uma
+        única perda de cache e deixa espaço livre para os próximos turnos voltarem a só acrescentar.
+        O bloco só é descartado por completo quando os próprios chunks novos ocupam todo o espaço.
+
+        Args:
+            documents (List[Document]): Os chunks recuperados no turno atual.
+
+        Returns:
+            Tuple[List[Document], bool]: Os chunks que entraram no contexto e se o prefixo mudou.
+        """
+        new_documents: List[Document] = []
+        for doc in documents:
+            chunk_id = doc.metadata.get('chunk_id', 'N/A')
+            if chunk_id not in self.documents and all(chunk_id != d.metadata.get('chunk_id', 'N/A') for d in new_documents):
+                new_documents.append(doc)
+
+        if len(self.documents) + len(new_documents) <= self.max_context_chunks:
+            for doc in new_documents:
+                self.documents[doc.metadata.get('chunk_id', 'N/A')] = doc
+            return new_documents, False
+
+        # Compactação: entre os chunks antigos, têm prioridade os que a busca atual também retornou
+        # e, depois deles, os mais recentes; os mantidos conservam a ordem original no bloco
+        new_documents = new_documents[:self.max_context_chunks]
+        keep = max(0, self.compacted_chunks - len(new_documents))
+        retrieved_ids = {doc.metadata.get('chunk_id', 'N/A') for doc in documents}
+        old_ids = list(self.documents.keys())
+        by_priority = [cid for cid in reversed(old_ids) if cid in retrieved_ids] + \
+                      [cid for cid in reversed(old_ids) if cid not in retrieved_ids]
+        kept_ids = set(by_priority[:keep])
+        kept = [self.documents[cid] for cid in old_ids if cid in kept_ids]
+
+        self.documents.clear()
+        for doc in kept + new_documents:
+            self.documents[doc.metadata.get('chunk_id', 'N/A')] = doc
+        return new_documents, True
+
+    def build_context(self) -> str:
+        """
+        Monta o texto de contexto com os chunks da sessão, sempre na ordem em que foram adicionados.
+        """
+        return "\n---\n".join(doc.page_content for doc in self.documents.values())
+
+    def build_history(self) -> str:
+        """
+        Monta o histórico da conversa dentro do limite de caracteres: os turnos recentes com
+        respostas pouco truncadas e, antes deles, um resumo dos turnos anteriores.
+        Os turnos mais novos têm prioridade quando o limite é atingido.
+        """
+        recent: List[str] = []
+        summary: List[str] = []
+        history = ""
+        for i, (question, answer) in enumerate(reversed(self.turns)):
+            if i < self.recent_turns:
+                candidate_recent = [f"Usuário: {question}\nAssistente: {_truncate(answer, SESSION_RECENT_ANSWER_CHARS)}"] + recent
+                candidate_summary = summary
+            else:
+                candidate_recent = recent
+                candidate_summary = [f"- P: {question} | R: {_truncate(answer, SESSION_SUMMARY_ANSWER_CHARS)}"] + summary
+            candidate = self._format_history(candidate_summary, candidate_recent)
+            if len(candidate) > self.history_max_chars:
+                break
+            recent, summary, history = candidate_recent, candidate_summary, candidate
+        return history
+
+    @staticmethod
+    def _format_history(summary: List[str], recent: List[str]) -> str:
+        parts: List[str] = []
+        if summary:
+            parts.append("Resumo da conversa anterior:\n" + "\n".join(summary))
+        parts.extend(recent)
+        return "\n\n".join(parts)
+
+    def add_turn(self, question: str, answer: str):
+        """
+        Registra um turno de conversa, descartando os que já não cabem no histórico.
+
+        Args:
+            question (str): A pergunta do usuário.
+            answer (str): A resposta gerada.
+        """
+        self.turns.append((question, answer))
+        keep = self.recent_turns + self.summary_turns
+        self.turns[:] = self.turns[-keep:] if keep else []
+
+    def reused_prefix_chars(self, context: str) -> int:
+        """
+        Calcula quantos caracteres do contexto atual repetem o contexto do turno anterior,
+        ou seja, quanto do prompt pode ser servido pelo cache de prefixo do servidor LLM.
+        """
+        return len(os.path.commonprefix([self.last_context, context]))
+
+    def reset(self):
+        """
+        Descarta todo o contexto e o histórico da sessão.
+        """
+        self.documents.clear()
+        self.turns.clear()
+        self.last_context = ""
@@ -31,6 +31,33 @@ class IDocumentRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Gera o embedding de uma consulta com o mesmo modelo usado para os documentos.
+
+        Args:
+            query (str): A consulta de texto.
+
+        Returns:
+            List[float]: O vetor de embedding da consulta.
+        """
+        pass
+
+    @abstractmethod
+    def search_documents_by_vector(self, embedding: List[float], k: int = 5) -> List[Document]:
+        """
+        Pesquisa documentos no repositório a partir de um embedding já calculado.
+
+        Args:
+            embedding (List[float]): O embedding da consulta.
+            k (int): O número de documentos mais relevantes a serem retornados.
+
+        Returns:
+            List[Document]: Uma lista de documentos relevantes.
+        """
+        pass
+
     @abstractmethod
     def get_document_by_id(self, doc_id: str) -> Document | None:
         """
@@ -1,14 +1,18 @@
 # src/domain/rag_service.py
 
 import os
+import time
 from typing import List, Tuple
 from langchain_core.documents import Document
 
 from src.domain.document_repository import IDocumentRepository
+from src.domain.chat_session import ChatSession
 from src.data.document_loader import DocumentLoader
 from src.data.document_parser import DocumentParser
 from src.infrastructure.llm_connector import LLMConnector
+from src.infrastructure.answer_cache import SemanticAnswerCache
 from src.core.exceptions import DocumentLoadingError, LLMGenerationError
+from src.core.config import SESSION_INITIAL_K, SESSION_FOLLOWUP_K
 
 class RAGService:
     """
@@ -21,7 +25,8 @@ class RAGService:
                  document_loader: DocumentLoader,
                  document_parser: DocumentParser,
                  document_repo: IDocumentRepository,
-                 llm_connector: LLMConnector):
+                 llm_connector: LLMConnector,
+                 answer_cache: SemanticAnswerCache | None = None):
         """
         Inicializa o RAGService.
 
@@ -30,11 +35,14 @@ class RAGService:
             document_parser (DocumentParser): O parser/splitter de documentos.
             document_repo (IDocumentRepository): O repositório para persistência de documentos e embeddings.
             llm_connector (LLMConnector): O conector para o modelo de linguagem (LLM).
+            answer_cache (SemanticAnswerCache | None): Cache opcional de respostas para perguntas
+                                                       repetidas ou quase idênticas.
         """
         self.document_loader = document_loader
         self.document_parser = document_parser
         self.document_repo = document_repo
         self.llm_connector = llm_connector
+        self.answer_cache = answer_cache
 
     def ingest_documents_from_directory(self, directory_path: str):
         """
@@ -63,18 +71,25 @@ class RAGService:
         chunks = self.document_parser.split_documents(loaded_documents)
         print(f"Total de {len(chunks)} chunks gerados.")
 
+        if self.answer_cache is not None:
+            # Respostas baseadas em chunks reingeridos podem estar desatualizadas
+            invalidated = self.answer_cache.invalidate_chunks(chunk.metadata['chunk_id'] for chunk in chunks)
+            if invalidated:
+                print(f"{invalidated} respostas em cache invalidadas pela reingestão.")
+
         print("Adicionando chunks ao banco de dados vetorial...")
         self.document_repo.add_documents(chunks)
         print("Documentos adicionados e embeddings gerados.")
         self.document_repo.persist_db() # Persiste o DB após adicionar
         print("Banco de dados vetorial persistido.")
 
-    def query_documents(self, query: str) -> Tuple[str, List[Document]]:
+    def query_documents(self, query: str, k: int = 5) -> Tuple[str, List[Document]]:
         """
         Realiza uma consulta RAG: pesquisa documentos relevantes e gera uma resposta com a LLM.
 
         Args:
             query (str): A pergunta do usuário.
+            k (int): O número de documentos (chunks) a recuperar como contexto.
 
         Returns:
             Tuple[str, List[Document]]: Uma tupla contendo a resposta gerada pela LLM
@@ -84,8 +99,14 @@ class RAGService:
             LLMGenerationError: Se a LLM falhar ao gerar uma resposta.
         """
         print(f"\nBuscando documentos relevantes para a consulta: '{query}'...")
-        retrieved_docs = self.document_repo.search_documents(query)
-        
+        query_embedding = None
+        if self.answer_cache is not None:
+            # O embedding é calculado uma vez e serve tanto para a busca quanto para o cache
+            query_embedding = self.document_repo.embed_query(query)
+            retrieved_docs = self.document_repo.search_documents_by_vector(query_embedding, k=k)
+        else:
+            retrieved_docs = self.document_repo.search_documents(query, k=k)
+
         if not retrieved_docs:
             print("Nenhum documento relevante encontrado para a consulta.")
             # Gerar uma resposta base sem contexto se nenhum documento for encontrado
@@ -95,15 +116,86 @@ class RAGService:
             except LLMGenerationError as e:
                 raise LLMGenerationError(f"Erro ao gerar resposta sem contexto: {e}")
 
+        if self.answer_cache is not None:
+            cached_response = self.answer_cache.lookup(query_embedding, self.llm_connector.model_name, retrieved_docs)
+            if cached_response is not None:
+                print("Resposta encontrada no cache para uma pergunta semelhante com os mesmos documentos.")
+                return cached_response, retrieved_docs
+
         # Construir o contexto para a LLM
         context_texts = "\n---\n".join([doc.page_content for doc in retrieved_docs])
         
         print(f"Documentos relevantes encontrados. Enviando para a LLM...")
         try:
             response = self.llm_connector.generate_response(query, context=context_texts)
+        except Exception as e:
+            raise LLMGenerationError(f"Erro ao gerar resposta da LLM: {e}")
+
+        if self.answer_cache is not None:
+            self.answer_cache.store(query_embedding, self.llm_connector.model_name, response, retrieved_docs)
+        return response, retrieved_docs
+
+    def query_with_session(self, query: str, session: ChatSession) -> Tuple[str, List[Document]]:
+        """
+        Realiza uma consulta RAG dentro de uma sessão de conversa.
+        A primeira pergunta segue o fluxo de `query_documents`; nas perguntas de acompanhamento,
+        a consulta é reescrita com base no histórico e apenas os chunks recuperados que ainda não
+        estão na sessão são acrescentados ao contexto já enviado à LLM.
+
+        Args:
+            query (str): A pergunta do usuário.
+            session (ChatSession): A sessão de conversa atual.
+
+        Returns:
+            Tuple[str, List[Document]]: Uma tupla contendo a resposta gerada pela LLM
+                                        e a lista de documentos (chunks) no contexto da sessão.
+
+        Raises:
+            LLMGenerationError: Se a LLM falhar ao gerar uma resposta.
+        """
+        start = time.perf_counter()
+        if not session.has_history:
+            response, retrieved_docs = self.query_documents(query, k=SESSION_INITIAL_K)
+            session.add_documents(retrieved_docs)
+            context = session.build_context()
+            self._print_turn_stats(len(context) + len(query), 0, time.perf_counter() - start)
+            session.last_context = context
+            session.add_turn(query, response)
             return response, retrieved_docs
+
+        print(f"\nBuscando documentos para a pergunta de acompanhamento: '{query}'...")
+        retrieved_docs = self.document_repo.search_documents(session.rewrite_query(query), k=SESSION_FOLLOWUP_K)
+        new_docs, prefix_changed = session.add_documents(retrieved_docs)
+        if prefix_changed:
+            print(f"Contexto da sessão compactado para {len(session.documents)} chunks ({len(new_docs)} novos); o prefixo muda neste turno.")
+        else:
+            print(f"{len(new_docs)} novos chunks adicionados; {len(session.documents)} chunks no contexto da sessão.")
+
+        context = session.build_context()
+        history = session.build_history()
+
+        print("Enviando pergunta com o contexto e o histórico da sessão para a LLM...")
+        try:
+            response = self.llm_connector.generate_response(query, context=context, history=history)
         except Exception as e:
             raise LLMGenerationError(f"Erro ao gerar resposta da LLM: {e}")
+        self._print_turn_stats(
+            len(context) + len(history) + len(query),
+            session.reused_prefix_chars(context),
+            time.perf_counter() - start
+        )
+
+        session.last_context = context
+        session.add_turn(query, response)
+        return response, list(session.documents.values())
+
+    @staticmethod
+    def _print_turn_stats(prompt_chars: int, reused_chars: int, elapsed_seconds: float):
+        """
+        Mostra o tamanho do prompt, quanto dele repete o prefixo do turno anterior e o tempo do turno.
+        """
+        print(f"Prompt: {prompt_chars} caracteres, dos quais {reused_chars} repetem o prefixo do turno anterior. "
+              f"Turno respondido em {elapsed_seconds:.1f} s (busca + LLM).")
 
     def load_repository(self):
         """
@@ -117,4 +209,6 @@ class RAGService:
         Limpa todos os documentos do repositório.
         """
         self.document_repo.clear_documents()
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
         print("Todos os documentos foram removidos do repositório.")
\ No newline at end of file
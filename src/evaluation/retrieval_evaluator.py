@@ -0,0 +1,569 @@
+# src/evaluation/retrieval_evaluator.py
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from itertools import product
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.stores import ByteStore
+
+from src.core.config import (
+    ARTICLES_DIR,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_MODEL_NAME,
+)
+from src.core.exceptions import DocumentLoadingError, EmbeddingGenerationError, LLMGenerationError
+from src.data.document_loader import DocumentLoader
+from src.data.document_parser import DocumentParser
+from src.infrastructure.llm_connector import LLMConnector
+from src.infrastructure.vector_store_impl import ChromaDocumentRepository
+
+
+@dataclass
+class EvaluationQuestion:
+    """
+    Pergunta de avaliação e os trechos do corpus que a respondem.
+    Os trechos são texto (e não IDs de chunks) porque os IDs mudam a cada configuração de chunking.
+    """
+    question: str
+    gold_passages: List[str]
+
+
+@dataclass
+class EvaluationConfig:
+    """Uma combinação de parâmetros de ingestão e busca a ser avaliada."""
+    chunk_size: int = CHUNK_SIZE
+    chunk_overlap: int = CHUNK_OVERLAP
+    embedding_model_name: str = EMBEDDING_MODEL_NAME
+    hnsw_search_ef: int | None = None
+
+    def describe(self) -> str:
+        description = f"chunk={self.chunk_size}/{self.chunk_overlap} modelo={self.embedding_model_name}"
+        if self.hnsw_search_ef is not None:
+            description += f" ef={self.hnsw_search_ef}"
+        return description
+
+
+@dataclass
+class EvaluationResult:
+    """Métricas de qualidade e custo de uma configuração."""
+    config: EvaluationConfig
+    # Fração média dos trechos de referência de cada pergunta cobertos pelos k primeiros chunks
+    recall_at_k: Dict[int, float] = field(default_factory=dict)
+    # Fração das perguntas com pelo menos um trecho de referência coberto nos k primeiros chunks
+    hit_at_k: Dict[int, float] = field(default_factory=dict)
+    mrr: float = 0.0
+    num_chunks: int = 0
+    index_size_bytes: int = 0
+    # Tempo de parede da ingestão; com várias configurações em paralelo, inclui a disputa por CPU
+    ingest_seconds: float = 0.0
+    # Chunks cujo embedding veio do cache em disco / foi calculado nesta ingestão
+    embedding_cache_hits: int = 0
+    embedding_cache_misses: int = 0
+    # Tempo médio, sem cache, para gerar o embedding de uma pergunta com o modelo da configuração
+    query_embed_ms: float = 0.0
+    # Latência apenas da busca vetorial (embedding da pergunta já calculado)
+    mean_query_ms: float = 0.0
+    p95_query_ms: float = 0.0
+
+
+# Fração mínima de um trecho de referência que um chunk precisa cobrir para ser considerado relevante
+MIN_PASSAGE_COVERAGE = 0.5
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _passage_coverage(chunk_text: str, passage_text: str) -> float:
+    """
+    Fração dos caracteres do trecho cobertos pelo maior segmento em comum com o chunk.
+    Um trecho que cruza a fronteira entre dois chunks tem mais da metade em um deles,
+    qualquer que seja a sobreposição, então o resultado não depende de `chunk_overlap`.
+    """
+    if not passage_text or not chunk_text:
+        return 0.0
+    if passage_text in chunk_text:
+        return 1.0
+    matcher = SequenceMatcher(None, passage_text, chunk_text, autojunk=False)
+    match = matcher.find_longest_match(0, len(passage_text), 0, len(chunk_text))
+    return match.size / len(passage_text)
+
+
+def _first_covering_ranks(retrieved: List[Document], gold_passages: List[str]) -> List[int | None]:
+    """
+    Para cada trecho de referência, a posição (a partir de 1) do primeiro chunk que cobre pelo
+    menos MIN_PASSAGE_COVERAGE dele, ou None se nenhum chunk recuperado o cobre.
+    """
+    passages = [_normalize_text(passage) for passage in gold_passages]
+    ranks: List[int | None] = [None] * len(passages)
+    for rank, doc in enumerate(retrieved, start=1):
+        chunk_text = _normalize_text(doc.page_content)
+        for i, passage in enumerate(passages):
+            if ranks[i] is None and _passage_coverage(chunk_text, passage) >= MIN_PASSAGE_COVERAGE:
+                ranks[i] = rank
+    return ranks
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            total += os.path.getsize(os.path.join(root, file_name))
+    return total
+
+
+def load_corpus(directory_path: str = ARTICLES_DIR) -> List[Document]:
+    """
+    Carrega todos os documentos suportados de um diretório, sem dividi-los em chunks.
+
+    Args:
+        directory_path (str): O diretório com os artigos.
+
+    Returns:
+        List[Document]: Os documentos brutos carregados.
+    """
+    loader = DocumentLoader()
+    documents: List[Document] = []
+    for root, _, files in os.walk(directory_path):
+        for file_name in files:
+            try:
+                documents.extend(loader.load_document(os.path.join(root, file_name)))
+            except DocumentLoadingError as e:
+                print(f" - Erro ao carregar {file_name}: {e}")
+    return documents
+
+
+def load_dataset(file_path: str) -> List[EvaluationQuestion]:
+    """
+    Carrega um conjunto de avaliação de um arquivo JSON no formato
+    [{"question": "...", "gold_passages": ["...", ...]}, ...].
+
+    Args:
+        file_path (str): O caminho do arquivo JSON.
+
+    Returns:
+        List[EvaluationQuestion]: As perguntas de avaliação.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        items = json.load(f)
+    return [EvaluationQuestion(question=item["question"], gold_passages=list(item["gold_passages"])) for item in items]
+
+
+def _is_valid_question(text: str, passage: str) -> bool:
+    """
+    Aceita apenas uma pergunta de uma linha, terminada em "?", que não seja cópia do trecho.
+    """
+    text = text.strip()
+    return (
+        bool(text)
+        and "\n" not in text
+        and text.endswith("?")
+        and len(text) <= 300
+        and _normalize_text(text) not in _normalize_text(passage)
+    )
+
+
+def generate_dataset(documents: List[Document],
+                     num_questions: int = 20,
+                     question_generator: LLMConnector | None = None) -> List[EvaluationQuestion]:
+    """
+    Gera automaticamente um conjunto de avaliação a partir do corpus ingerido.
+    Frases de tamanho médio, distribuídas ao longo do corpus, viram trechos de referência.
+    Se um `question_generator` for informado, a LLM escreve uma pergunta para cada trecho;
+    caso contrário (ou se a saída da LLM não for uma pergunta válida), o próprio trecho é usado
+    como consulta.
+
+    Args:
+        documents (List[Document]): Os documentos brutos do corpus.
+        num_questions (int): O número de perguntas a gerar.
+        question_generator (LLMConnector | None): Conector LLM opcional para escrever as perguntas.
+
+    Returns:
+        List[EvaluationQuestion]: As perguntas de avaliação.
+    """
+    sentences: List[str] = []
+    for doc in documents:
+        for sentence in re.split(r"(?<=[.!?])\s+", doc.page_content):
+            sentence = " ".join(sentence.split())
+            if 80 <= len(sentence) <= 300:
+                sentences.append(sentence)
+
+    if not sentences or num_questions <= 0:
+        return []
+
+    step = max(1, len(sentences) // num_questions)
+    passages = sentences[::step][:num_questions]
+
+    dataset: List[EvaluationQuestion] = []
+    rejected = 0
+    for passage in passages:
+        question = passage
+        if question_generator is not None:
+            generated = question_generator.generate_question(passage)
+            if _is_valid_question(generated, passage):
+                question = generated
+            else:
+                rejected += 1
+        dataset.append(EvaluationQuestion(question=question, gold_passages=[passage]))
+
+    if rejected:
+        print(f"{rejected} saídas da LLM não eram perguntas válidas; o trecho foi usado como pergunta nesses casos.")
+    return dataset
+
+
+class _CountingByteStore(ByteStore):
+    """
+    Encaminha as operações a um ByteStore compartilhado sob um lock (evitando ler um arquivo
+    de cache ainda sendo escrito por outra thread) e conta acertos e faltas de cada configuração.
+    """
+
+    def __init__(self, store: ByteStore, lock: threading.Lock):
+        self.store = store
+        self.lock = lock
+        self.hits = 0
+        self.misses = 0
+
+    def mget(self, keys: Sequence[str]) -> List[bytes | None]:
+        with self.lock:
+            values = self.store.mget(keys)
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, bytes]]) -> None:
+        with self.lock:
+            self.store.mset(key_value_pairs)
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        with self.lock:
+            self.store.mdelete(keys)
+
+    def yield_keys(self, *, prefix: str | None = None) -> Iterator[str]:
+        with self.lock:
+            keys = list(self.store.yield_keys(prefix=prefix))
+        yield from keys
+
+
+class RetrievalEvaluator:
+    """
+    Avalia o impacto conjunto dos parâmetros de chunking, do modelo de embeddings e da busca
+    sobre a qualidade (recall@k, MRR) e o custo (tamanho do índice, tempo de ingestão e latência)
+    da recuperação. Cada configuração é ingerida em um ChromaDB temporário e isolado, e os
+    embeddings dos chunks são guardados em cache em disco para que textos inalterados não sejam
+    recalculados. As ingestões rodam em paralelo; as consultas são medidas depois, uma
+    configuração por vez, com os embeddings das perguntas calculados uma única vez por modelo.
+    """
+
+    def __init__(self, documents: List[Document], cache_dir: str = EMBEDDING_CACHE_DIR):
+        """
+        Inicializa o avaliador.
+
+        Args:
+            documents (List[Document]): Os documentos brutos do corpus (antes do chunking).
+            cache_dir (str): O diretório do cache de embeddings.
+        """
+        self.documents = documents
+        self.embedding_store = LocalFileStore(cache_dir)
+        self._store_lock = threading.Lock()
+        self._models: Dict[str, Embeddings] = {}
+        self._models_lock = threading.Lock()
+
+    def _get_model(self, model_name: str) -> Embeddings:
+        """
+        Retorna o modelo de embeddings (sem cache), carregando-o uma única vez.
+        """
+        with self._models_lock:
+            if model_name not in self._models:
+                try:
+                    self._models[model_name] = HuggingFaceEmbeddings(model_name=model_name)
+                except Exception as e:
+                    raise EmbeddingGenerationError(f"Erro ao inicializar o modelo de embeddings '{model_name}': {e}")
+            return self._models[model_name]
+
+    def embed_questions(self, model_name: str, dataset: List[EvaluationQuestion]) -> Tuple[List[List[float]], float]:
+        """
+        Gera, sem cache, os embeddings das perguntas com um modelo.
+
+        Args:
+            model_name (str): O nome do modelo de embeddings.
+            dataset (List[EvaluationQuestion]): As perguntas de avaliação.
+
+        Returns:
+            Tuple[List[List[float]], float]: Os embeddings e o tempo médio por pergunta, em ms.
+        """
+        model = self._get_model(model_name)
+        start = time.perf_counter()
+        embeddings = [model.embed_query(item.question) for item in dataset]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return embeddings, (elapsed_ms / len(dataset) if dataset else 0.0)
+
+    def _ingest(self, config: EvaluationConfig) -> Tuple[ChromaDocumentRepository, str, EvaluationResult]:
+        """
+        Ingere o corpus com uma configuração em um diretório temporário.
+        O chamador é responsável por remover o diretório retornado.
+        """
+        result = EvaluationResult(config=config)
+        store = _CountingByteStore(self.embedding_store, self._store_lock)
+        embeddings = CacheBackedEmbeddings.from_bytes_store(
+            self._get_model(config.embedding_model_name),
+            store,
+            namespace=config.embedding_model_name
+        )
+        collection_metadata = None
+        if config.hnsw_search_ef is not None:
+            collection_metadata = {"hnsw:search_ef": config.hnsw_search_ef}
+
+        db_directory = tempfile.mkdtemp(prefix="paper_pal_eval_")
+        try:
+            start = time.perf_counter()
+            parser = DocumentParser(chunk_size=config.chunk_size, chunk_overlap=config.chunk_overlap)
+            chunks = parser.split_documents(self.documents)
+            repo = ChromaDocumentRepository(
+                db_directory=db_directory,
+                embedding_model_name=config.embedding_model_name,
+                embeddings=embeddings,
+                collection_metadata=collection_metadata
+            )
+            repo.add_documents(chunks)
+            repo.persist_db()
+            result.ingest_seconds = time.perf_counter() - start
+            result.num_chunks = len(chunks)
+            result.index_size_bytes = _directory_size(db_directory)
+            result.embedding_cache_hits = store.hits
+            result.embedding_cache_misses = store.misses
+        except Exception:
+            shutil.rmtree(db_directory, ignore_errors=True)
+            raise
+        return repo, db_directory, result
+
+    @staticmethod
+    def _measure_queries(repo: ChromaDocumentRepository,
+                         result: EvaluationResult,
+                         dataset: List[EvaluationQuestion],
+                         query_embeddings: List[List[float]],
+                         k_values: List[int]):
+        """
+        Mede recall@k, hit@k, MRR e a latência da busca vetorial de uma configuração já ingerida.
+        """
+        if not dataset:
+            return
+        max_k = max(k_values)
+        hits = {k: 0 for k in k_values}
+        recall_sums = {k: 0.0 for k in k_values}
+        reciprocal_ranks: List[float] = []
+        latencies_ms: List[float] = []
+        for item, embedding in zip(dataset, query_embeddings):
+            start = time.perf_counter()
+            retrieved = repo.search_documents_by_vector(embedding, k=max_k)
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+            covering_ranks = _first_covering_ranks(retrieved, item.gold_passages)
+            found_ranks = [rank for rank in covering_ranks if rank is not None]
+            first_rank = min(found_ranks, default=None)
+            reciprocal_ranks.append(1.0 / first_rank if first_rank else 0.0)
+            for k in k_values:
+                if first_rank is not None and first_rank <= k:
+                    hits[k] += 1
+                if covering_ranks:
+                    recall_sums[k] += sum(rank <= k for rank in found_ranks) / len(covering_ranks)
+
+        result.recall_at_k = {k: recall_sums[k] / len(dataset) for k in k_values}
+        result.hit_at_k = {k: hits[k] / len(dataset) for k in k_values}
+        result.mrr = statistics.mean(reciprocal_ranks)
+        result.mean_query_ms = statistics.mean(latencies_ms)
+        result.p95_query_ms = sorted(latencies_ms)[max(0, int(round(0.95 * len(latencies_ms))) - 1)]
+
+    def sweep(self,
+              configs: List[EvaluationConfig],
+              dataset: List[EvaluationQuestion],
+              k_values: List[int],
+              max_workers: int = 2) -> List[EvaluationResult]:
+        """
+        Avalia várias configurações: ingestão em paralelo, consultas em série.
+
+        Args:
+            configs (List[EvaluationConfig]): As configurações a avaliar.
+            dataset (List[EvaluationQuestion]): As perguntas de avaliação.
+            k_values (List[int]): Os valores de k para o recall@k.
+            max_workers (int): O número de ingestões simultâneas. Use 1 para que `ingest_seconds`
+                               não inclua a disputa por CPU entre configurações.
+
+        Returns:
+            List[EvaluationResult]: Os resultados, na mesma ordem de `configs`.
+        """
+        query_embeddings: Dict[str, Tuple[List[List[float]], float]] = {}
+        for model_name in dict.fromkeys(config.embedding_model_name for config in configs):
+            query_embeddings[model_name] = self.embed_questions(model_name, dataset)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._ingest, config) for config in configs]
+        ingested = [future.result() for future in futures if future.exception() is None]
+
+        try:
+            failure = next((future.exception() for future in futures if future.exception() is not None), None)
+            if failure is not None:
+                raise failure
+
+            # Consultas medidas uma configuração por vez, sem concorrência com outras ingestões
+            for repo, _, result in ingested:
+                embeddings, embed_ms = query_embeddings[result.config.embedding_model_name]
+                result.query_embed_ms = embed_ms
+                self._measure_queries(repo, result, dataset, embeddings, k_values)
+        finally:
+            for _, db_directory, _ in ingested:
+                shutil.rmtree(db_directory, ignore_errors=True)
+        return [result for _, _, result in ingested]
+
+    def evaluate_config(self,
+                        config: EvaluationConfig,
+                        dataset: List[EvaluationQuestion],
+                        k_values: List[int]) -> EvaluationResult:
+        """
+        Ingere o corpus com uma configuração e mede a recuperação sobre o conjunto de avaliação.
+
+        Args:
+            config (EvaluationConfig): A configuração a avaliar.
+            dataset (List[EvaluationQuestion]): As perguntas de avaliação.
+            k_values (List[int]): Os valores de k para o recall@k.
+
+        Returns:
+            EvaluationResult: As métricas da configuração.
+        """
+        return self.sweep([config], dataset, k_values, max_workers=1)[0]
+
+
+def build_grid(chunk_sizes: List[int],
+               chunk_overlaps: List[int],
+               embedding_model_names: List[str],
+               hnsw_search_efs: List[int | None] | None = None) -> List[EvaluationConfig]:
+    """
+    Monta todas as combinações de parâmetros, ignorando sobreposições maiores ou iguais ao chunk.
+    """
+    return [
+        EvaluationConfig(chunk_size=size, chunk_overlap=overlap, embedding_model_name=model, hnsw_search_ef=ef)
+        for size, overlap, model, ef in product(chunk_sizes, chunk_overlaps, embedding_model_names, hnsw_search_efs or [None])
+        if overlap < size
+    ]
+
+
+def format_results(results: List[EvaluationResult]) -> str:
+    """
+    Formata os resultados como uma tabela de texto, ordenada pelo MRR.
+    """
+    if not results:
+        return "Nenhum resultado."
+    k_values = sorted(results[0].recall_at_k)
+    header = (
+        ["configuração"]
+        + [f"R@{k}" for k in k_values]
+        + [f"Hit@{k}" for k in k_values]
+        + ["MRR", "chunks", "índice (KB)", "ingestão (s)", "cache emb.", "emb. pergunta (ms)", "busca (ms)", "p95 (ms)"]
+    )
+    rows = [header]
+    for result in sorted(results, key=lambda r: r.mrr, reverse=True):
+        cached_total = result.embedding_cache_hits + result.embedding_cache_misses
+        rows.append(
+            [result.config.describe()]
+            + [f"{result.recall_at_k.get(k, 0.0):.2f}" for k in k_values]
+            + [f"{result.hit_at_k.get(k, 0.0):.2f}" for k in k_values]
+            + [
+                f"{result.mrr:.3f}",
+                str(result.num_chunks),
+                f"{result.index_size_bytes / 1024:.0f}",
+                f"{result.ingest_seconds:.1f}",
+                f"{result.embedding_cache_hits}/{cached_total}",
+                f"{result.query_embed_ms:.1f}",
+                f"{result.mean_query_ms:.1f}",
+                f"{result.p95_query_ms:.1f}",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def main():
+    """
+    Executa uma varredura padrão sobre os artigos em ARTICLES_DIR.
+    As perguntas vêm de um arquivo (--dataset) ou são geradas a partir do corpus, escritas pela
+    LLM quando o LM Studio está disponível.
+    """
+    arg_parser = argparse.ArgumentParser(description="Avaliação de qualidade e velocidade da recuperação.")
+    arg_parser.add_argument("--dataset", help="Arquivo JSON com perguntas e trechos de referência (veja load_dataset).")
+    arg_parser.add_argument("--num-questions", type=int, default=20, help="Número de perguntas geradas a partir do corpus.")
+    arg_parser.add_argument("--no-llm", action="store_true", help="Não usar a LLM para escrever as perguntas geradas.")
+    arg_parser.add_argument("--workers", type=int, default=2, help="Número de ingestões simultâneas.")
+    arg_parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[500, CHUNK_SIZE, 1500],
+                            help="Valores de CHUNK_SIZE a avaliar.")
+    arg_parser.add_argument("--overlaps", type=int, nargs="+", default=[100, CHUNK_OVERLAP],
+                            help="Valores de CHUNK_OVERLAP a avaliar (combinações com sobreposição >= chunk são ignoradas).")
+    arg_parser.add_argument("--models", nargs="+", default=[EMBEDDING_MODEL_NAME],
+                            help="Modelos de embeddings (HuggingFace) a avaliar.")
+    arg_parser.add_argument("--search-ef", type=int, nargs="+", default=None,
+                            help="Valores de hnsw:search_ef do Chroma a avaliar (padrão: o do Chroma).")
+    arg_parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10],
+                            help="Valores de k para recall@k e hit@k.")
+    args = arg_parser.parse_args()
+
+    print(f"Carregando corpus de: {ARTICLES_DIR}")
+    documents = load_corpus(ARTICLES_DIR)
+    if not documents:
+        print("Nenhum documento encontrado para avaliação.")
+        return
+
+    if args.dataset:
+        dataset = load_dataset(args.dataset)
+        dataset_source = f"arquivo {args.dataset}"
+    else:
+        dataset = []
+        dataset_source = ""
+        if not args.no_llm:
+            try:
+                dataset = generate_dataset(documents, args.num_questions, question_generator=LLMConnector())
+                dataset_source = ("perguntas escritas pela LLM a partir de trechos do corpus "
+                                  "(saídas inválidas substituídas pelo próprio trecho)")
+            except LLMGenerationError as e:
+                print(f"LLM indisponível para gerar perguntas ({e}).")
+        if not dataset:
+            dataset = generate_dataset(documents, args.num_questions)
+            dataset_source = ("ALTERNATIVA SEM LLM: os próprios trechos do corpus são as perguntas "
+                              "(busca quase literal; recall e MRR ficam otimistas)")
+    print(f"{len(dataset)} perguntas de avaliação. Origem: {dataset_source}.")
+
+    configs = build_grid(
+        chunk_sizes=args.chunk_sizes,
+        chunk_overlaps=args.overlaps,
+        embedding_model_names=args.models,
+        hnsw_search_efs=args.search_ef
+    )
+    if not configs:
+        print("Nenhuma configuração válida: todas as sobreposições são maiores ou iguais ao tamanho do chunk.")
+        return
+    print(f"{len(configs)} configurações a avaliar.")
+
+    evaluator = RetrievalEvaluator(documents)
+    results = evaluator.sweep(configs, dataset, k_values=sorted(set(args.k)), max_workers=args.workers)
+    print(f"\nOrigem das perguntas: {dataset_source}")
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# src/evaluation/session_prompt_simulation.py
+
+import os
+from typing import Dict, List
+from langchain_core.documents import Document
+
+from src.core.config import CHUNK_SIZE, SESSION_INITIAL_K, SESSION_FOLLOWUP_K
+from src.domain.chat_session import ChatSession
+
+# Conversa simulada: (pergunta, tópico). Três tópicos, com perguntas de acompanhamento em cada um.
+CONVERSATION = [
+    ("Qual a metodologia principal do estudo?", 0),
+    ("e os resultados?", 0),
+    ("e isso vale para o segundo experimento?", 0),
+    ("quais limitações?", 0),
+    ("Quais datasets foram usados na avaliação do modelo?", 1),
+    ("e o tamanho deles?", 1),
+    ("como isso se compara ao baseline?", 1),
+    ("e a latência?", 1),
+    ("Quem são os autores do trabalho relacionado citado?", 2),
+    ("e o ano?", 2),
+]
+ANSWER = "A metodologia combina modelos de linguagem com recuperação de documentos científicos. " * 5
+CHUNKS_PER_TOPIC = 20
+
+
+def _build_corpus() -> List[Document]:
+    corpus = []
+    for i in range(CHUNKS_PER_TOPIC * (max(topic for _, topic in CONVERSATION) + 1)):
+        text = (f"chunk {i} " * CHUNK_SIZE)[:CHUNK_SIZE]
+        corpus.append(Document(page_content=text, metadata={"chunk_id": f"artigo.pdf_chunk_{i}"}))
+    return corpus
+
+
+def simulate() -> List[Dict[str, int]]:
+    """
+    Compara, turno a turno, o prompt de uma consulta isolada (`query_documents`, sem histórico)
+    com o de uma sessão (`ChatSession`), ambos com a MESMA busca: os k primeiros chunks de um
+    ranking que, a cada pergunta sobre o mesmo tópico, desliza uma posição.
+    O prompt de sistema é igual nos dois casos e não é contado.
+
+    Returns:
+        List[Dict[str, int]]: Por turno, os caracteres do prompt e os fora do prefixo reaproveitável
+                              (da consulta isolada e da sessão) e se o prefixo da sessão mudou.
+    """
+    corpus = _build_corpus()
+    session = ChatSession()
+    offsets: Dict[int, int] = {}
+    rows: List[Dict[str, int]] = []
+    previous_standalone_context = ""
+
+    for question, topic in CONVERSATION:
+        offset = offsets.get(topic, -1) + 1
+        offsets[topic] = offset
+        ranking = corpus[topic * CHUNKS_PER_TOPIC + offset:]
+
+        k = SESSION_FOLLOWUP_K if session.has_history else SESSION_INITIAL_K
+        retrieved = ranking[:k]
+        standalone_context = "\n---\n".join(doc.page_content for doc in retrieved)
+        standalone_chars = len(standalone_context) + len(question)
+        standalone_reused = len(os.path.commonprefix([previous_standalone_context, standalone_context]))
+        previous_standalone_context = standalone_context
+
+        _, prefix_changed = session.add_documents(retrieved)
+        context = session.build_context()
+        history = session.build_history()
+        session_chars = len(context) + len(history) + len(question)
+        reused = session.reused_prefix_chars(context)
+
+        rows.append({
+            "standalone": standalone_chars,
+            "standalone_recomputed": standalone_chars - standalone_reused,
+            "session": session_chars,
+            "recomputed": session_chars - reused,
+            "prefix_changed": int(prefix_changed and session.has_history),
+        })
+        session.last_context = context
+        session.add_turn(question, ANSWER)
+    return rows
+
+
+def main():
+    """
+    Imprime a comparação turno a turno e os totais da conversa simulada.
+    """
+    rows = simulate()
+    columns = [
+        ("isolada", "standalone"),
+        ("isolada fora do prefixo", "standalone_recomputed"),
+        ("sessão", "session"),
+        ("sessão fora do prefixo", "recomputed"),
+    ]
+    print(f"Busca de {SESSION_INITIAL_K} chunks por turno nos dois casos; chunks de {CHUNK_SIZE} caracteres.")
+    print("turno  " + "  ".join(f"{title:>{len(title)}}" for title, _ in columns) + "  prefixo da sessão mudou")
+    for turn, row in enumerate(rows, start=1):
+        cells = "  ".join(f"{row[key]:>{len(title)}}" for title, key in columns)
+        print(f"{turn:>5}  {cells}  {'sim' if row['prefix_changed'] else ''}")
+    totals = "  ".join(f"{sum(row[key] for row in rows):>{len(title)}}" for title, key in columns)
+    print(f"total  {totals}  {sum(row['prefix_changed'] for row in rows)} turnos")
+
+
+if __name__ == "__main__":
+    main()
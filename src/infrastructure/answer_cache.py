@@ -0,0 +1,192 @@
+# src/infrastructure/answer_cache.py
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.core.config import (
+    ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    ANSWER_CACHE_TTL_SECONDS,
+    ANSWER_CACHE_MAX_ENTRIES,
+)
+
+# Identificação de um chunk recuperado: (chunk_id, hash do conteúdo). O hash protege contra IDs
+# reaproveitados para outro conteúdo, já que o índice do chunk_id é sequencial em cada ingestão.
+ChunkFingerprint = Tuple[str, str]
+
+# Chave de uma entrada: (nome do modelo, chunks recuperados, bytes do embedding normalizado)
+CacheKey = Tuple[str, FrozenSet[ChunkFingerprint], bytes]
+
+
+def _fingerprints(documents: List[Document]) -> FrozenSet[ChunkFingerprint]:
+    return frozenset(
+        (doc.metadata.get('chunk_id', ''), hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest())
+        for doc in documents
+    )
+
+
+@dataclass
+class _CacheEntry:
+    """Resposta armazenada no cache, junto com os dados usados para encontrá-la e invalidá-la."""
+    embedding: np.ndarray
+    model_name: str
+    chunks: FrozenSet[ChunkFingerprint]
+    response: str
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """
+    Cache de respostas da LLM indexado pelo embedding da pergunta.
+
+    As entradas ficam em um pequeno índice vetorial em memória (uma matriz de embeddings
+    normalizados). Uma resposta só é reutilizada quando a pergunta é quase idêntica, o modelo é
+    o mesmo e a busca atual recuperou exatamente os mesmos chunks (ID e conteúdo), de modo que
+    apenas a chamada à LLM é evitada e documentos novos ou alterados nunca são ignorados.
+    O cache aplica expiração por tempo (TTL), descarte LRU e é invalidado quando algum
+    chunk usado em uma resposta é reingerido ou removido.
+    """
+
+    def __init__(self,
+                 similarity_threshold: float = ANSWER_CACHE_SIMILARITY_THRESHOLD,
+                 ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+                 max_entries: int = ANSWER_CACHE_MAX_ENTRIES):
+        """
+        Inicializa o cache semântico de respostas.
+
+        Args:
+            similarity_threshold (float): Similaridade de cosseno mínima para considerar um acerto.
+            ttl_seconds (float): Tempo de vida de cada entrada, em segundos.
+            max_entries (int): Número máximo de entradas antes do descarte LRU.
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        # Índice vetorial reconstruído sob demanda sempre que as entradas mudam
+        self._index_keys: List[CacheKey] = []
+        self._index_matrix: np.ndarray | None = None
+        self._index_dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(embedding: Iterable[float]) -> np.ndarray:
+        vector = np.asarray(list(embedding), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _remove(self, key: CacheKey):
+        del self._entries[key]
+        self._index_dirty = True
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if now - entry.created_at > self.ttl_seconds]
+        for key in expired:
+            self._remove(key)
+
+    def _rebuild_index(self):
+        self._index_keys = list(self._entries.keys())
+        if self._index_keys:
+            self._index_matrix = np.stack([self._entries[key].embedding for key in self._index_keys])
+        else:
+            self._index_matrix = None
+        self._index_dirty = False
+
+    def lookup(self, query_embedding: List[float], model_name: str, documents: List[Document]) -> str | None:
+        """
+        Procura uma resposta armazenada para uma pergunta semelhante com o mesmo contexto.
+
+        Args:
+            query_embedding (List[float]): O embedding da pergunta do usuário.
+            model_name (str): O nome do modelo que gerará a resposta.
+            documents (List[Document]): Os chunks recuperados agora para a pergunta.
+
+        Returns:
+            str | None: A resposta armazenada, ou None se não houver entrada suficientemente
+                        similar gerada a partir dos mesmos chunks.
+        """
+        self._evict_expired()
+        if not self._entries:
+            return None
+        if self._index_dirty:
+            self._rebuild_index()
+
+        chunks = _fingerprints(documents)
+        query_vector = self._normalize(query_embedding)
+        if self._index_matrix.shape[1] != query_vector.shape[0]:
+            # Embeddings de outro modelo de embeddings não são comparáveis
+            return None
+
+        similarities = self._index_matrix @ query_vector
+        for row in np.argsort(-similarities):
+            if similarities[row] < self.similarity_threshold:
+                break
+            key = self._index_keys[row]
+            entry = self._entries[key]
+            if entry.model_name != model_name or entry.chunks != chunks:
+                continue
+            self._entries.move_to_end(key)
+            return entry.response
+        return None
+
+    def store(self, query_embedding: List[float], model_name: str, response: str, documents: List[Document]):
+        """
+        Armazena uma resposta gerada pela LLM.
+
+        Args:
+            query_embedding (List[float]): O embedding da pergunta do usuário.
+            model_name (str): O nome do modelo que gerou a resposta.
+            response (str): A resposta gerada.
+            documents (List[Document]): Os documentos (chunks) usados como contexto.
+        """
+        embedding = self._normalize(query_embedding)
+        chunks = _fingerprints(documents)
+        key: CacheKey = (model_name, chunks, embedding.tobytes())
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(
+            embedding=embedding,
+            model_name=model_name,
+            chunks=chunks,
+            response=response,
+            created_at=time.monotonic(),
+        )
+        self._index_dirty = True
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_chunks(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Remove todas as entradas cuja resposta dependa de algum dos chunks informados.
+
+        Args:
+            chunk_ids (Iterable[str]): IDs dos chunks reingeridos ou removidos.
+
+        Returns:
+            int: O número de entradas removidas.
+        """
+        changed = set(chunk_ids)
+        stale = [
+            key for key, entry in self._entries.items()
+            if any(chunk_id in changed for chunk_id, _ in entry.chunks)
+        ]
+        for key in stale:
+            self._remove(key)
+        return len(stale)
+
+    def clear(self):
+        """
+        Remove todas as entradas do cache.
+        """
+        self._entries.clear()
+        self._index_dirty = True
@@ -20,6 +20,8 @@ class LLMConnector:
             model_name (str): O nome do modelo a ser usado (pode ser ignorado pelo LM Studio
                               se apenas um modelo estiver carregado).
         """
+        self.model_name = model_name
+
         # Inicializa ChatOpenAI apontando para o LM Studio
         # A chave de API não é necessária para o LM Studio local
         self.llm = ChatOpenAI(
@@ -35,13 +37,14 @@ class LLMConnector:
         # O prompt `self.template` e `self.prompt` serão removidos ou adaptados para uso futuro com LCEL
         # Por enquanto, vamos construir a lista de mensagens diretamente na função generate_response.
 
-    def generate_response(self, question: str, context: str = "") -> str:
+    def generate_response(self, question: str, context: str = "", history: str = "") -> str:
         """
         Gera uma resposta da LLM com base na pergunta e no contexto fornecido.
 
         Args:
             question (str): A pergunta do usuário.
             context (str): O texto de contexto recuperado dos documentos.
+            history (str): O histórico da conversa (resumo e turnos recentes), se houver.
 
         Returns:
             str: A resposta gerada pela LLM.
@@ -54,10 +57,14 @@ class LLMConnector:
                 SystemMessage(content="Você é um assistente de leitura de artigos científicos. Use as informações do CONTEXTO para responder à PERGUNTA do usuário. Se a resposta não estiver no contexto, diga que não tem informações suficientes nos documentos fornecidos. Seja conciso, útil e direto."),
             ]
 
+            # O contexto vem primeiro e o histórico depois, para que o início do prompt se repita
+            # entre turnos de uma sessão e possa ser reaproveitado pelo cache de prefixo do servidor
+            content = f"PERGUNTA: {question}"
+            if history.strip():
+                content = f"HISTÓRICO DA CONVERSA:\n{history}\n\n{content}"
             if context.strip():
-                messages.append(HumanMessage(content=f"CONTEXTO:\n{context}\n\nPERGUNTA: {question}"))
-            else:
-                messages.append(HumanMessage(content=f"PERGUNTA: {question}"))
+                content = f"CONTEXTO:\n{context}\n\n{content}"
+            messages.append(HumanMessage(content=content))
 
             print("Enviando requisição à LLM...")
             # Usar .invoke com a lista de mensagens
@@ -65,4 +72,29 @@ class LLMConnector:
             return response.content.strip() # ChatOpenAI retorna um objeto ChatMessage
 
         except Exception as e:
-            raise LLMGenerationError(f"Erro ao chamar a LLM para geração de resposta: {e}")
\ No newline at end of file
+            raise LLMGenerationError(f"Erro ao chamar a LLM para geração de resposta: {e}")
+
+    def generate_question(self, passage: str) -> str:
+        """
+        Pede à LLM uma pergunta cuja resposta esteja no trecho fornecido.
+        Usado para montar conjuntos de avaliação da recuperação.
+
+        Args:
+            passage (str): O trecho do documento.
+
+        Returns:
+            str: O texto gerado pela LLM (idealmente, uma única pergunta).
+
+        Raises:
+            LLMGenerationError: Se a chamada à LLM falhar.
+        """
+        try:
+            messages = [
+                SystemMessage(content="Você cria perguntas para avaliar um sistema de busca em artigos científicos. Dado um TRECHO, escreva uma única pergunta curta, em uma linha, que possa ser respondida pelo trecho. Não responda à pergunta, não copie o trecho literalmente e não escreva nada além da pergunta."),
+                HumanMessage(content=f"TRECHO:\n{passage}")
+            ]
+            response = self.llm.invoke(messages)
+            return response.content.strip()
+
+        except Exception as e:
+            raise LLMGenerationError(f"Erro ao chamar a LLM para geração de pergunta: {e}")
@@ -4,6 +4,7 @@ from typing import List
 from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import HuggingFaceEmbeddings # Para embeddings locais
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 import os
 
 from src.domain.document_repository import IDocumentRepository
@@ -15,17 +16,26 @@ class ChromaDocumentRepository(IDocumentRepository):
     Implementação do IDocumentRepository usando ChromaDB como banco de dados vetorial.
     """
 
-    def __init__(self, db_directory: str = CHROMA_DB_DIR, embedding_model_name: str = EMBEDDING_MODEL_NAME):
+    def __init__(self,
+                 db_directory: str = CHROMA_DB_DIR,
+                 embedding_model_name: str = EMBEDDING_MODEL_NAME,
+                 embeddings: Embeddings | None = None,
+                 collection_metadata: dict | None = None):
         """
         Inicializa o repositório ChromaDB.
 
         Args:
             db_directory (str): O caminho para o diretório onde o ChromaDB será persistido.
             embedding_model_name (str): O nome do modelo de embeddings a ser usado.
+            embeddings (Embeddings | None): Instância de embeddings já inicializada (ex: com cache).
+                                            Se None, o modelo `embedding_model_name` é carregado.
+            collection_metadata (dict | None): Metadados da coleção Chroma, como parâmetros do índice
+                                               HNSW (ex: {"hnsw:search_ef": 50}).
         """
         self.db_directory = db_directory
         self.embedding_model_name = embedding_model_name
-        self.embeddings = self._initialize_embeddings()
+        self.collection_metadata = collection_metadata
+        self.embeddings = embeddings if embeddings is not None else self._initialize_embeddings()
         self.vector_store: Chroma | None = None
         self.load_existing_db() # Tenta carregar o DB existente na inicialização
 
@@ -53,7 +63,8 @@ class ChromaDocumentRepository(IDocumentRepository):
             self.vector_store = Chroma.from_documents(
                 documents,
                 self.embeddings,
-                persist_directory=self.db_directory
+                persist_directory=self.db_directory,
+                collection_metadata=self.collection_metadata
             )
         else:
             print(f"Adicionando {len(documents)} documentos ao banco de dados Chroma existente...")
@@ -81,6 +92,44 @@ class ChromaDocumentRepository(IDocumentRepository):
         print(f"Encontrados {len(results)} documentos relevantes.")
         return results
 
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Gera o embedding de uma consulta com o modelo de embeddings do repositório.
+
+        Args:
+            query (str): A consulta de texto.
+
+        Returns:
+            List[float]: O vetor de embedding da consulta.
+
+        Raises:
+            EmbeddingGenerationError: Se o modelo de embeddings falhar.
+        """
+        try:
+            return self.embeddings.embed_query(query)
+        except Exception as e:
+            raise EmbeddingGenerationError(f"Erro ao gerar embedding da consulta: {e}")
+
+    def search_documents_by_vector(self, embedding: List[float], k: int = 5) -> List[Document]:
+        """
+        Pesquisa documentos por similaridade vetorial a partir de um embedding já calculado,
+        evitando gerar novamente o embedding da consulta.
+
+        Args:
+            embedding (List[float]): O embedding da consulta.
+            k (int): O número de documentos mais relevantes a serem retornados.
+
+        Returns:
+            List[Document]: Uma lista de documentos relevantes (chunks).
+        """
+        if self.vector_store is None:
+            print("Banco de dados vetorial não carregado ou não existe. Retornando lista vazia.")
+            return []
+
+        results = self.vector_store.similarity_search_by_vector(embedding, k=k)
+        print(f"Encontrados {len(results)} documentos relevantes.")
+        return results
+
     def get_document_by_id(self, doc_id: str) -> Document | None:
         """
         Recupera um documento específico (chunk) pelo seu ID de metadado.
@@ -130,7 +179,8 @@ class ChromaDocumentRepository(IDocumentRepository):
             print(f"Carregando banco de dados Chroma existente de: {self.db_directory}")
             self.vector_store = Chroma(
                 persist_directory=self.db_directory,
-                embedding_function=self.embeddings # Importante passar a função de embedding novamente
+                embedding_function=self.embeddings, # Importante passar a função de embedding novamente
+                collection_metadata=self.collection_metadata
             )
             print("Banco de dados Chroma carregado.")
         else:
@@ -4,6 +4,7 @@ from src.data.document_loader import DocumentLoader
 from src.data.document_parser import DocumentParser
 from src.infrastructure.vector_store_impl import ChromaDocumentRepository
 from src.infrastructure.llm_connector import LLMConnector
+from src.infrastructure.answer_cache import SemanticAnswerCache
 from src.domain.rag_service import RAGService
 from src.presentation.cli_chatbot import CLIChatbot
 from src.core.config import ARTICLES_DIR, CHROMA_DB_DIR # Importar os diretórios do config
@@ -16,6 +17,7 @@ def main():
     print("Inicializando componentes de infraestrutura...")
     llm_connector = LLMConnector()
     document_repo = ChromaDocumentRepository() # Tenta carregar o DB existente aqui
+    answer_cache = SemanticAnswerCache()
 
     # 2. Inicializa os componentes da camada de Dados
     print("Inicializando componentes de dados...")
@@ -28,7 +30,8 @@ def main():
         document_loader=document_loader,
         document_parser=document_parser,
         document_repo=document_repo,
-        llm_connector=llm_connector
+        llm_connector=llm_connector,
+        answer_cache=answer_cache
     )
 
     # 4. Inicializa e executa a Interface de Usuário
@@ -1,6 +1,7 @@
 # src/presentation/cli_chatbot.py
 
 from src.domain.rag_service import RAGService
+from src.domain.chat_session import ChatSession
 from src.core.exceptions import LLMGenerationError
 import os
 from src.core.config import ARTICLES_DIR # Importa o diretório dos artigos
@@ -18,6 +19,7 @@ class CLIChatbot:
             rag_service (RAGService): O serviço RAG que lida com a lógica de negócio.
         """
         self.rag_service = rag_service
+        self.session = ChatSession()
         self._check_articles_directory() # Verifica se a pasta de artigos existe
 
     def _check_articles_directory(self):
@@ -36,6 +38,7 @@ class CLIChatbot:
         print("Comandos disponíveis:")
         print("  - 'ingest' para carregar novos documentos na base de conhecimento.")
         print("  - 'clear' para remover todos os documentos da base de conhecimento.")
+        print("  - 'reset' para iniciar uma nova conversa (descarta o histórico).")
         print("  - 'exit' ou 'quit' para sair.")
         print("-" * 50)
 
@@ -50,22 +53,28 @@ class CLIChatbot:
                 break
             elif user_input == 'ingest':
                 self.rag_service.ingest_documents_from_directory(ARTICLES_DIR)
+                self.session.reset() # Chunks da sessão podem ter sido reingeridos
                 print("Ingestão de documentos concluída.")
                 continue
             elif user_input == 'clear':
                 confirm = input("Tem certeza que deseja remover todos os documentos? (sim/não): ").strip().lower()
                 if confirm == 'sim':
                     self.rag_service.clear_all_documents()
+                    self.session.reset()
                 else:
                     print("Operação de limpeza cancelada.")
                 continue
+            elif user_input == 'reset':
+                self.session.reset()
+                print("Nova conversa iniciada.")
+                continue
 
             if not user_input:
                 print("Por favor, digite sua pergunta ou um comando.")
                 continue
 
             try:
-                response, retrieved_docs = self.rag_service.query_documents(user_input)
+                response, retrieved_docs = self.rag_service.query_with_session(user_input, self.session)
                 print("\n" + "=" * 50)
                 print("Resposta do Paper-Pal-RAG:")
                 print(response)